@@ -1,7 +1,5 @@
 import base64
-import json
 import logging
-from pathlib import Path
 
 from griptape_nodes.exe_types.core_types import Parameter, ParameterGroup, ParameterList, ParameterMode
 from griptape_nodes.exe_types.node_types import AsyncResult, ControlNode
@@ -21,7 +19,7 @@ try:
 except ImportError:
     GOOGLE_INSTALLED = False
 
-from googleai_utils import GoogleAuthHelper
+from googleai_utils import GoogleAuthHelper, get_service_account_project_id
 from griptape_nodes.files.file import File
 
 logger = logging.getLogger("griptape_nodes_library_googleai")
@@ -174,16 +172,13 @@ class BaseAnalyzeMedia(ControlNode):
 
     def _get_project_id(self, service_account_file: str) -> str:
         """Read the project_id from the service account JSON file."""
-        if not Path(service_account_file).exists():
+        try:
+            project_id = get_service_account_project_id(service_account_file)
+        except FileNotFoundError:
             msg = f"Service account file not found: {service_account_file}"
             logger.error(msg)
             self._log(msg)
-            raise FileNotFoundError(msg)
-
-        with Path(service_account_file).open(encoding="utf-8") as f:
-            service_account_info = json.load(f)
-
-        project_id = service_account_info.get("project_id")
+            raise FileNotFoundError(msg) from None
         if not project_id:
             msg = "No 'project_id' found in the service account file."
             logger.error(msg)
@@ -0,0 +1,244 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, ClassVar
+
+from griptape.artifacts import VideoUrlArtifact
+from griptape_nodes.exe_types.node_types import ControlNode
+
+# Attempt to import Google libraries
+try:
+    from google import genai
+    from google.cloud import aiplatform, storage
+
+    GOOGLE_INSTALLED = True
+except ImportError:
+    GOOGLE_INSTALLED = False
+
+from googleai_utils import LogBuffer, backoff_delays, build_pooled_session, parse_gcs_uri
+
+logger = logging.getLogger("griptape_nodes_library_googleai")
+
+# How long a cached client (and its HTTP transport) is reused before being rebuilt
+CLIENT_CACHE_TTL_SECONDS = 3600
+
+# Upper bound on concurrent GCS downloads per node run
+MAX_DOWNLOAD_WORKERS = 4
+
+# Buffered log lines are appended to the logs output once either limit is reached
+LOG_FLUSH_MAX_LINES = 10
+LOG_FLUSH_INTERVAL_SECONDS = 1.0
+
+# Individual video outputs in grid order (row-major, two columns):
+# (parameter name, row, column, number_of_videos values for which it is hidden)
+VIDEO_GRID: tuple[tuple[str, int, int, tuple[int, ...]], ...] = (
+    ("video_1_1", 1, 1, ()),
+    ("video_1_2", 1, 2, (1,)),
+    ("video_2_1", 2, 1, (1, 2)),
+    ("video_2_2", 2, 2, (1, 2, 3)),
+)
+VIDEO_GRID_PARAMS = tuple(name for name, _, _, _ in VIDEO_GRID)
+
+
+class BaseVeoVideoGenerator(ControlNode):
+    """Buffered logging, client reuse, operation polling, GCS downloads and result saving shared by the Veo nodes.
+
+    Subclasses provide ``logs``, ``video_artifacts`` and ``VIDEO_GRID_PARAMS`` output parameters
+    and an ``_output_file`` ProjectFileParameter.
+    """
+
+    # Class-level client caches; each entry is (client, credentials, created_at)
+    # GCS clients, keyed by (project_id, id(credentials))
+    _gcs_client_cache: ClassVar[dict[tuple[str, int], tuple[Any, Any, float]]] = {}
+    # Generative AI clients, keyed by (project_id, location, id(credentials))
+    _genai_client_cache: ClassVar[dict[tuple[str, str, int], tuple[Any, Any, float]]] = {}
+    # (project_id, location, id(credentials)) combinations already passed to aiplatform.init
+    _aiplatform_initialized: ClassVar[dict[tuple[str, str, int], tuple[None, Any, float]]] = {}
+    # Guards the caches above, which every Veo node shares
+    _client_cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # Operation polling backoff (first delay and cap) and minimum time between "still generating" log lines
+    POLL_BASE_DELAY_SECONDS = 2.0
+    POLL_MAX_DELAY_SECONDS = 15.0
+    POLL_LOG_INTERVAL_SECONDS = 15
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        # Buffered log lines, shared safely with reference-image and download worker threads
+        self._log_buffer = LogBuffer(
+            lambda text: self.append_value_to_parameter("logs", text),
+            max_lines=LOG_FLUSH_MAX_LINES,
+            interval_seconds=LOG_FLUSH_INTERVAL_SECONDS,
+        )
+
+    def _log(self, message: str) -> None:
+        """Buffer a message for the logs output parameter, flushing in batches."""
+        logger.info(message)
+        self._log_buffer.append(message)
+
+    def _flush_logs(self) -> None:
+        """Append all buffered log lines to the logs output parameter in a single update."""
+        self._log_buffer.flush()
+
+    def _clear_logs(self) -> None:
+        """Drop buffered log lines that have not been flushed yet."""
+        self._log_buffer.clear()
+
+    def _reset_outputs(self) -> None:
+        """Clear output parameters so stale values don't persist across re-adds/reruns."""
+        self._clear_logs()
+        try:
+            # Only write keys that hold a value, so unchanged outputs don't trigger UI updates
+            outputs = self.parameter_output_values
+            if outputs.get("logs"):
+                outputs["logs"] = ""
+            if outputs.get("video_artifacts"):
+                outputs["video_artifacts"] = []
+            for param_name in VIDEO_GRID_PARAMS:
+                if outputs.get(param_name) is not None:
+                    outputs[param_name] = None
+        except Exception:
+            # Be defensive if ControlNode changes how outputs are stored
+            pass
+
+    @classmethod
+    def _get_cached_client(cls, cache: dict, key: tuple, credentials, factory: Callable[[], Any]) -> Any:
+        """Return the cached value for key if it is fresh and was built for these credentials, else build a new one.
+
+        Entries keep a reference to their credentials, so the ``id(credentials)`` in a live key can't be reused by
+        another object, and expired entries are evicted so clients for rotated credentials don't accumulate.
+        """
+        now = time.monotonic()
+        with cls._client_cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                value, cached_credentials, created_at = cached
+                if cached_credentials is credentials and now - created_at < CLIENT_CACHE_TTL_SECONDS:
+                    return value
+
+            expired_keys = [
+                k for k, (_, _, created_at) in cache.items() if now - created_at >= CLIENT_CACHE_TTL_SECONDS
+            ]
+            for expired_key in expired_keys:
+                del cache[expired_key]
+
+            value = factory()
+            cache[key] = (value, credentials, now)
+            return value
+
+    def _init_aiplatform(self, project_id: str, location: str, credentials) -> None:
+        """Initialize Vertex AI at most once per project, location and credentials."""
+        self._get_cached_client(
+            self._aiplatform_initialized,
+            (project_id, location, id(credentials)),
+            credentials,
+            lambda: aiplatform.init(project=project_id, location=location, credentials=credentials),
+        )
+
+    def _get_genai_client(self, project_id: str, location: str, credentials):
+        """Get a cached or new Generative AI client."""
+        return self._get_cached_client(
+            self._genai_client_cache,
+            (project_id, location, id(credentials)),
+            credentials,
+            lambda: genai.Client(vertexai=True, project=project_id, location=location, credentials=credentials),
+        )
+
+    def _get_gcs_client(self, project_id: str, credentials):
+        """Get a cached or new GCS client bound to these credentials, rebuilding it after the TTL."""
+        return self._get_cached_client(
+            self._gcs_client_cache,
+            (project_id, id(credentials)),
+            credentials,
+            lambda: storage.Client(
+                project=project_id, credentials=credentials, _http=build_pooled_session(credentials)
+            ),
+        )
+
+    def _resolve_gcs_blobs(self, gcs_uris: dict[int, str], project_id: str, credentials) -> dict[int, Any]:
+        """Resolve GCS URIs to blobs, creating one bucket object per distinct bucket."""
+        storage_client = self._get_gcs_client(project_id, credentials)
+        buckets: dict[str, Any] = {}
+        blobs = {}
+        for i, gcs_uri in gcs_uris.items():
+            bucket_name, blob_path = parse_gcs_uri(gcs_uri)
+            bucket = buckets.get(bucket_name)
+            if bucket is None:
+                bucket = buckets[bucket_name] = storage_client.bucket(bucket_name)
+            blobs[i] = bucket.blob(blob_path)
+            self._log(f"📥 Downloading from GCS URI: {gcs_uri}")
+        return blobs
+
+    @staticmethod
+    def _download_blob(blob) -> bytes:
+        """Download a resolved GCS blob and return bytes. Safe to call from worker threads."""
+        # MP4 output is never gzip-encoded, so skip the transcoding/decompression path
+        return blob.download_as_bytes(raw_download=True)
+
+    def _save_gcs_videos(
+        self, gcs_uris: dict[int, str], saved_artifacts: list[VideoUrlArtifact | None], project_id: str, credentials
+    ) -> None:
+        """Download GCS-hosted videos concurrently, saving each into its slot in ``saved_artifacts`` as it lands.
+
+        The client and blobs are resolved once on the calling thread; worker threads only download.
+        """
+        blobs = self._resolve_gcs_blobs(gcs_uris, project_id, credentials)
+        with ThreadPoolExecutor(max_workers=min(len(blobs), MAX_DOWNLOAD_WORKERS)) as executor:
+            futures = {executor.submit(self._download_blob, blob): i for i, blob in blobs.items()}
+            for future in as_completed(futures):
+                # Pop finished futures so their bytes aren't held until every download is done
+                i = futures.pop(future)
+                saved_artifacts[i] = self._save_video(i, future.result())
+
+    def _wait_for_operation(self, client, operation):
+        """Poll a long-running operation with exponential backoff and return its final state."""
+        start = last_log = time.monotonic()
+        for delay in backoff_delays(base=self.POLL_BASE_DELAY_SECONDS, max_delay=self.POLL_MAX_DELAY_SECONDS):
+            if operation.done:
+                return operation
+            logger.debug("Next operation poll in %.1fs", delay)
+            time.sleep(delay)
+            operation = client.operations.get(operation)
+            now = time.monotonic()
+            if now - last_log >= self.POLL_LOG_INTERVAL_SECONDS:
+                self._log(f"⏳ Still generating... ({int(now - start)}s elapsed)")
+                last_log = now
+        return operation
+
+    def _get_generated_videos(self, operation) -> list[Any] | None:
+        """Return the generated videos from a finished operation, logging why there are none."""
+        # Videos are in operation.response, not operation.result
+        response = getattr(operation, "response", None)
+        if not response:
+            self._log("❌ Video generation completed but no response found.")
+            return None
+
+        # Check for content filtering
+        filtered_count = getattr(response, "rai_media_filtered_count", None)
+        if filtered_count:
+            self._log(f"🚫 Content Filter: {filtered_count} video(s) were filtered by Google's content policy.")
+            for reason in getattr(response, "rai_media_filtered_reasons", None) or ():
+                self._log(f"   Reason: {reason}")
+            self._log("💡 Tip: Try rephrasing your prompt to avoid violent, sexual, or harmful content.")
+            return None
+
+        generated_videos = getattr(response, "generated_videos", None)
+        if not generated_videos:
+            self._log("❌ No videos found in the response.")
+            return None
+
+        self._log(f"🎯 Generated {len(generated_videos)} video(s)")
+        return generated_videos
+
+    def _save_video(self, index: int, video_bytes: bytes | None) -> VideoUrlArtifact | None:
+        """Save video bytes to project storage and return the artifact, or None if there is no data."""
+        if not video_bytes:
+            self._log(f"❌ Could not retrieve video data for video {index + 1}.")
+            return None
+
+        self._log(f"Saving video {index + 1} bytes to project storage...")
+        saved = self._output_file.build_file().write_bytes(video_bytes)
+        self._log(f"✅ Video {index + 1} saved. URL: {saved.location}")
+        return VideoUrlArtifact(value=saved.location, name=saved.location)
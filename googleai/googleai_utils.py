@@ -1,9 +1,15 @@
 """Common utilities for GoogleAI nodes."""
 
+import functools
+import hashlib
 import json
 import os
-from collections.abc import Callable
-from typing import Any
+import random
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from typing import Any, ClassVar
 
 
 def detect_image_mime_from_bytes(data: bytes) -> str | None:
@@ -26,6 +32,109 @@ def detect_image_mime_from_bytes(data: bytes) -> str | None:
     return None
 
 
+@functools.lru_cache(maxsize=8)
+def _load_service_account_project_id(service_account_file: str, mtime_ns: int) -> str | None:
+    """Read project_id from a service account file; mtime is part of the cache key so rotation invalidates it."""
+    with open(service_account_file, "rb") as f:
+        return json_loads(f.read()).get("project_id")
+
+
+def get_service_account_project_id(service_account_file: str) -> str | None:
+    """Return the project_id from a service account JSON file, memoized until the file changes.
+
+    Raises:
+        FileNotFoundError: If the service account file does not exist
+    """
+    return _load_service_account_project_id(service_account_file, os.stat(service_account_file).st_mtime_ns)
+
+
+def parse_gcs_uri(gcs_uri: str) -> tuple[str, str]:
+    """Split a gs://bucket/path URI into (bucket_name, blob_path).
+
+    Raises:
+        ValueError: If the URI is not a gs:// URI with both a bucket and an object path
+    """
+    bucket_name, _, blob_path = gcs_uri[5:].partition("/")
+    if not gcs_uri.startswith("gs://") or not bucket_name or not blob_path:
+        raise ValueError(f"Invalid GCS URI: {gcs_uri}")
+    return bucket_name, blob_path
+
+
+def backoff_delays(base: float = 2.0, factor: float = 1.5, max_delay: float = 15.0) -> Iterator[float]:
+    """Yield exponentially growing sleep intervals with jitter for polling long-running operations.
+
+    Args:
+        base: First delay in seconds
+        factor: Multiplier applied after each attempt
+        max_delay: Upper bound for every yielded delay, jitter included
+    """
+    delay = base
+    while True:
+        # Jitter below the cap so concurrent pollers don't fall into lockstep once they reach it
+        yield random.uniform(0.5, 1.0) * min(max_delay, delay)
+        delay = min(max_delay, delay * factor)
+
+
+class LogBuffer:
+    """Thread-safe buffer that batches log lines and hands them to ``flush_func`` as one string.
+
+    Lines are flushed once ``max_lines`` are buffered or ``interval_seconds`` have passed since the
+    last flush, so the first line after a quiet period is shown immediately.
+    """
+
+    def __init__(self, flush_func: Callable[[str], None], max_lines: int, interval_seconds: float) -> None:
+        self._flush_func = flush_func
+        self._max_lines = max_lines
+        self._interval_seconds = interval_seconds
+        self._lines: list[str] = []
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def append(self, message: str) -> None:
+        """Buffer a message, flushing if either limit has been reached."""
+        with self._lock:
+            self._lines.append(message + "\n")
+            should_flush = (
+                len(self._lines) >= self._max_lines or time.monotonic() - self._last_flush >= self._interval_seconds
+            )
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> None:
+        """Hand all buffered lines to ``flush_func`` in a single call."""
+        with self._lock:
+            if self._lines:
+                self._flush_func("".join(self._lines))
+                self._lines.clear()
+            self._last_flush = time.monotonic()
+
+    def clear(self) -> None:
+        """Drop buffered lines that have not been flushed yet."""
+        with self._lock:
+            self._lines.clear()
+
+
+def build_pooled_session(credentials: Any, pool_size: int = 64) -> Any | None:
+    """Build an AuthorizedSession with a larger HTTPS connection pool, for ``storage.Client(_http=...)``.
+
+    Concurrent downloads then share keep-alive connections instead of recycling them.
+    Retries are left to google-cloud-storage's own retry policy.
+
+    Args:
+        credentials: Google credentials to authorize requests with
+        pool_size: Number of pooled connections per host
+
+    Returns:
+        The session, or None for Application Default Credentials or when requests/google-auth
+        aren't installed, in which case the client builds its own transport
+    """
+    if credentials is None or not REQUESTS_INSTALLED or not GOOGLE_AUTH_INSTALLED:
+        return None
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+    return session
+
+
 try:
     import io as _io
 
@@ -35,9 +144,24 @@ try:
 except Exception:
     PIL_INSTALLED = False
 
+try:
+    import orjson
+
+    # orjson parses bytes and str directly; its JSONDecodeError subclasses json.JSONDecodeError
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+try:
+    from requests.adapters import HTTPAdapter
+
+    REQUESTS_INSTALLED = True
+except ImportError:
+    REQUESTS_INSTALLED = False
+
 try:
     import google.auth
-    from google.auth.transport.requests import Request
+    from google.auth.transport.requests import AuthorizedSession, Request
     from google.oauth2 import service_account
 
     GOOGLE_AUTH_INSTALLED = True
@@ -74,6 +198,73 @@ class GoogleAuthHelper:
     CREDENTIALS_JSON = "GOOGLE_APPLICATION_CREDENTIALS_JSON"
     WORKLOAD_IDENTITY_CONFIG_PATH = "GOOGLE_WORKLOAD_IDENTITY_CONFIG_PATH"
 
+    # Secret values are reused for this long so settings edits are still picked up without a restart
+    SECRET_CACHE_TTL_SECONDS = 30.0
+    _secret_cache: ClassVar[dict[str, tuple[Any, float]]] = {}
+    # Guards the class-level caches, which nodes running in parallel share
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # Process-wide LRU cache of (credentials, project_id), keyed by credential source.
+    # google-auth refreshes access tokens on the cached Credentials objects as needed.
+    CREDENTIALS_CACHE_MAX_ENTRIES = 4
+    _credentials_cache: ClassVar[OrderedDict[tuple, tuple[Any, str]]] = OrderedDict()
+
+    @classmethod
+    def _get_secret(cls, secrets_manager: Any, key: str) -> Any:
+        """Return a secret from the secrets manager, reusing recent lookups."""
+        now = time.monotonic()
+        with cls._cache_lock:
+            cached = cls._secret_cache.get(key)
+        if cached is not None and now - cached[1] < cls.SECRET_CACHE_TTL_SECONDS:
+            return cached[0]
+        value = secrets_manager.get_secret(key)
+        with cls._cache_lock:
+            cls._secret_cache[key] = (value, now)
+        return value
+
+    @classmethod
+    def invalidate_secret_cache(cls) -> None:
+        """Forget cached secret values so the next lookup reads them from the secrets manager.
+
+        Called whenever authentication fails, so corrected settings are picked up on the very next run.
+        """
+        with cls._cache_lock:
+            cls._secret_cache.clear()
+
+    @staticmethod
+    def _get_mtime(path: str | None) -> int | None:
+        """Return the file's modification time in nanoseconds with a single stat, or None if it doesn't exist."""
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _json_cache_key(credentials_json: str, fallback_project_id: str | None) -> tuple:
+        """Build a cache key for inline JSON credentials without retaining the secret itself."""
+        return ("json", hashlib.sha1(credentials_json.encode("utf-8")).hexdigest(), fallback_project_id)
+
+    @classmethod
+    def _get_or_load_credentials(cls, key: tuple, loader: Callable[[], tuple[Any, str]]) -> tuple[Any, str]:
+        """Return cached (credentials, project_id) for key, loading and storing them on a miss.
+
+        Only the most recently used entries are kept, so rotated key files and edited JSON don't accumulate.
+        """
+        with cls._cache_lock:
+            cached = cls._credentials_cache.get(key)
+            if cached is not None:
+                cls._credentials_cache.move_to_end(key)
+                return cached
+        result = loader()
+        with cls._cache_lock:
+            cls._credentials_cache[key] = result
+            cls._credentials_cache.move_to_end(key)
+            while len(cls._credentials_cache) > cls.CREDENTIALS_CACHE_MAX_ENTRIES:
+                cls._credentials_cache.popitem(last=False)
+        return result
+
     @staticmethod
     def get_credentials_and_project(
         secrets_manager: Any, log_func: Callable[[str], None] | None = None
@@ -98,28 +289,29 @@ class GoogleAuthHelper:
                 log_func(msg)
 
         # Get all auth-related secrets
-        workload_identity_config = secrets_manager.get_secret(GoogleAuthHelper.WORKLOAD_IDENTITY_CONFIG_PATH)
-        service_account_file = secrets_manager.get_secret(GoogleAuthHelper.SERVICE_ACCOUNT_FILE_PATH)
-        project_id = secrets_manager.get_secret(GoogleAuthHelper.PROJECT_ID)
-        credentials_json = secrets_manager.get_secret(GoogleAuthHelper.CREDENTIALS_JSON)
-
-        credentials = None
-        final_project_id = None
+        get_secret = GoogleAuthHelper._get_secret
+        workload_identity_config = get_secret(secrets_manager, GoogleAuthHelper.WORKLOAD_IDENTITY_CONFIG_PATH)
+        service_account_file = get_secret(secrets_manager, GoogleAuthHelper.SERVICE_ACCOUNT_FILE_PATH)
+        project_id = get_secret(secrets_manager, GoogleAuthHelper.PROJECT_ID)
+        credentials_json = get_secret(secrets_manager, GoogleAuthHelper.CREDENTIALS_JSON)
 
         # Option 1: Workload Identity Federation
-        if workload_identity_config and os.path.exists(workload_identity_config):
+        workload_identity_mtime = GoogleAuthHelper._get_mtime(workload_identity_config)
+        if workload_identity_mtime is not None:
             _log("🔑 Using workload identity federation for authentication.")
-            try:
+
+            def _load_workload_identity() -> tuple[Any, str]:
                 # Use google.auth.load_credentials_from_file which auto-detects the
                 # credential type (identity_pool, aws, pluggable) based on the config file
                 credentials, _ = google.auth.load_credentials_from_file(
                     workload_identity_config, scopes=["https://www.googleapis.com/auth/cloud-platform"]
                 )
 
+                final_project_id = None
                 # Try to extract project_id from config
                 try:
-                    with open(workload_identity_config, encoding="utf-8") as f:
-                        config = json.load(f)
+                    with open(workload_identity_config, "rb") as f:
+                        config = json_loads(f.read())
                         # Try to extract from service account impersonation email
                         if "service_account_impersonation" in config:
                             sa_email = config["service_account_impersonation"].get("service_account_email", "")
@@ -138,41 +330,56 @@ class GoogleAuthHelper:
                     raise ValueError(
                         "Could not determine project ID from workload identity config. Set GOOGLE_CLOUD_PROJECT_ID."
                     )
+                return credentials, final_project_id
 
+            try:
+                credentials, final_project_id = GoogleAuthHelper._get_or_load_credentials(
+                    ("workload_identity", workload_identity_config, workload_identity_mtime, project_id),
+                    _load_workload_identity,
+                )
                 _log(f"✅ Workload identity federation authentication successful for project: {final_project_id}")
                 return credentials, final_project_id
 
             except Exception as e:
                 _log(f"❌ Workload identity federation authentication failed: {e}")
+                GoogleAuthHelper.invalidate_secret_cache()
                 raise
 
         # Option 2: Service Account File
-        if service_account_file and os.path.exists(service_account_file):
+        service_account_mtime = GoogleAuthHelper._get_mtime(service_account_file)
+        if service_account_mtime is not None:
             _log("🔑 Using service account file for authentication.")
-            try:
-                with open(service_account_file, encoding="utf-8") as f:
-                    sa_data = json.load(f)
-                    final_project_id = sa_data.get("project_id")
 
-                credentials = service_account.Credentials.from_service_account_file(
-                    service_account_file, scopes=["https://www.googleapis.com/auth/cloud-platform"]
-                )
+            def _load_service_account_file() -> tuple[Any, str]:
+                final_project_id = _load_service_account_project_id(service_account_file, service_account_mtime)
 
                 if not final_project_id:
                     raise ValueError("Service account file does not contain 'project_id'.")
 
+                credentials = service_account.Credentials.from_service_account_file(
+                    service_account_file, scopes=["https://www.googleapis.com/auth/cloud-platform"]
+                )
+                return credentials, final_project_id
+
+            try:
+                credentials, final_project_id = GoogleAuthHelper._get_or_load_credentials(
+                    ("service_account_file", service_account_file, service_account_mtime),
+                    _load_service_account_file,
+                )
                 _log(f"✅ Service account file authentication successful for project: {final_project_id}")
                 return credentials, final_project_id
 
             except Exception as e:
                 _log(f"❌ Service account file authentication failed: {e}")
+                GoogleAuthHelper.invalidate_secret_cache()
                 raise
 
         # Option 3: Service Account JSON string
         if credentials_json:
             _log("🔑 Using JSON credentials for authentication.")
-            try:
-                cred_dict = json.loads(credentials_json)
+
+            def _load_credentials_json() -> tuple[Any, str]:
+                cred_dict = json_loads(credentials_json)
                 credentials = service_account.Credentials.from_service_account_info(
                     cred_dict, scopes=["https://www.googleapis.com/auth/cloud-platform"]
                 )
@@ -183,12 +390,19 @@ class GoogleAuthHelper:
                         "Could not determine project ID. Provide GOOGLE_CLOUD_PROJECT_ID or "
                         "include 'project_id' in GOOGLE_APPLICATION_CREDENTIALS_JSON."
                     )
+                return credentials, final_project_id
 
+            try:
+                credentials, final_project_id = GoogleAuthHelper._get_or_load_credentials(
+                    GoogleAuthHelper._json_cache_key(credentials_json, project_id),
+                    _load_credentials_json,
+                )
                 _log(f"✅ JSON credentials authentication successful for project: {final_project_id}")
                 return credentials, final_project_id
 
             except Exception as e:
                 _log(f"❌ JSON credentials authentication failed: {e}")
+                GoogleAuthHelper.invalidate_secret_cache()
                 raise
 
         # Option 4: Application Default Credentials (ADC)
@@ -200,6 +414,7 @@ class GoogleAuthHelper:
             return None, final_project_id
 
         # No valid auth method found
+        GoogleAuthHelper.invalidate_secret_cache()
         raise ValueError(
             "No credentials provided. Configure one of: "
             "GOOGLE_WORKLOAD_IDENTITY_CONFIG_PATH, "
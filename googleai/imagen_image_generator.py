@@ -20,7 +20,7 @@ try:
 except ImportError:
     GOOGLE_INSTALLED = False
 
-from googleai_utils import GoogleAuthHelper
+from googleai_utils import GoogleAuthHelper, parse_gcs_uri
 
 logger = logging.getLogger("griptape_nodes_library_googleai")
 
@@ -228,12 +228,7 @@ class VertexAIImageGenerator(ControlNode):
         """Download video from GCS URI and return bytes."""
         self._log(f"📥 Downloading from GCS URI: {gcs_uri}")
 
-        if not gcs_uri.startswith("gs://"):
-            raise ValueError(f"Invalid GCS URI: {gcs_uri}")
-
-        path_parts = gcs_uri[5:].split("/", 1)
-        bucket_name = path_parts[0]
-        blob_path = path_parts[1]
+        bucket_name, blob_path = parse_gcs_uri(gcs_uri)
 
         storage_client = self._get_gcs_client(project_id, credentials)
 
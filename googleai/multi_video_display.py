@@ -4,6 +4,18 @@ from griptape_nodes.exe_types.core_types import Parameter, ParameterMode
 from griptape_nodes.exe_types.node_types import AsyncResult, DataNode
 
 
+def _video_output_parameter(name: str, row: int, col: int) -> Parameter:
+    """Build the output parameter for the video at grid position [row, col]."""
+    return Parameter(
+        name=name,
+        type="VideoUrlArtifact",
+        output_type="VideoUrlArtifact",
+        tooltip=f"Video at grid position [{row},{col}]",
+        ui_options={"hide_property": True},
+        allowed_modes={ParameterMode.OUTPUT},
+    )
+
+
 class VideoDisplayNode(DataNode):
     """A node that displays video players in the UI for video URL artifacts."""
 
@@ -49,30 +61,25 @@ class VideoDisplayNode(DataNode):
         videos = self.get_parameter_value("videos")
 
         # First, dynamically add output parameters based on video count
+        # Grid output names, one per video: video_1_1, video_1_2, video_2_1, ...
+        grid_names = [f"video_{(i // 2) + 1}_{(i % 2) + 1}" for i in range(len(videos) if videos else 0)]
+
         if videos:
-            video_count = len(videos)
-
-            # Remove any existing video output parameters first
-            params_to_remove = [param for param in self.parameters if param.name.startswith("video_")]
-            for param in params_to_remove:
-                self.parameters.remove(param)
-
-            # Add parameters for each video
-            for i in range(video_count):
-                row = (i // 2) + 1  # Row: 1, 1, 2, 2, 3, 3...
-                col = (i % 2) + 1  # Col: 1, 2, 1, 2, 1, 2...
-                param_name = f"video_{row}_{col}"
-
-                self.add_parameter(
-                    Parameter(
-                        name=param_name,
-                        type="VideoUrlArtifact",
-                        output_type="VideoUrlArtifact",
-                        tooltip=f"Video at grid position [{row},{col}]",
-                        ui_options={"hide_property": True},
-                        allowed_modes={ParameterMode.OUTPUT},
-                    )
-                )
+            wanted_names = set(grid_names)
+            existing_names = {param.name for param in self.parameters if param.name.startswith("video_")}
+
+            # Keep outputs that are still needed in place; only drop the ones beyond the new video count
+            if existing_names - wanted_names:
+                self.parameters[:] = [
+                    param
+                    for param in self.parameters
+                    if not param.name.startswith("video_") or param.name in wanted_names
+                ]
+
+            # Add parameters for videos that don't have an output yet
+            for i, param_name in enumerate(grid_names):
+                if param_name not in existing_names:
+                    self.add_parameter(_video_output_parameter(param_name, (i // 2) + 1, (i % 2) + 1))
 
         # Debug logging - this was working!
         status_msg = f"📥 Received {len(videos) if videos else 0} videos\n"
@@ -89,18 +96,9 @@ class VideoDisplayNode(DataNode):
         else:
             status_msg += "❌ No videos received or videos is None\n"
 
-        # Set grid inputs and individual video outputs
-        self.parameter_output_values["videos"] = videos
-
-        # Assign each video to its grid position output
-        for i, video in enumerate(videos):
-            row = (i // 2) + 1  # Row: 1, 1, 2, 2, 3, 3...
-            col = (i % 2) + 1  # Col: 1, 2, 1, 2, 1, 2...
-            param_name = f"video_{row}_{col}"
-            self.parameter_output_values[param_name] = video
-
-        # Update status for debugging
-        self.parameter_output_values["status"] = status_msg
+        # Set the grid input, each video's grid position output and the debug status in a single update
+        grid_outputs = dict(zip(grid_names, videos or [], strict=False))
+        self.parameter_output_values.update({"videos": videos, **grid_outputs, "status": status_msg})
 
         # Trigger UI refresh for the videos parameter
         self.publish_update_to_parameter("videos", videos)
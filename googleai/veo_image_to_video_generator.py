@@ -1,11 +1,9 @@
-import logging
-import os
-import time
+import traceback
 from typing import Any
 
 from griptape.artifacts import ImageArtifact, ImageUrlArtifact, VideoUrlArtifact
 from griptape_nodes.exe_types.core_types import Parameter, ParameterGroup, ParameterMessage, ParameterMode
-from griptape_nodes.exe_types.node_types import AsyncResult, ControlNode
+from griptape_nodes.exe_types.node_types import AsyncResult
 from griptape_nodes.exe_types.param_components.project_file_parameter import ProjectFileParameter
 from griptape_nodes.exe_types.param_components.seed_parameter import SeedParameter
 from griptape_nodes.exe_types.param_types.parameter_image import ParameterImage
@@ -18,18 +16,15 @@ from griptape_nodes.traits.options import Options
 
 # Attempt to import Google libraries
 try:
-    from google import genai
-    from google.cloud import aiplatform, storage
     from google.genai.types import GenerateVideosConfig, Image
 
     GOOGLE_INSTALLED = True
 except ImportError:
     GOOGLE_INSTALLED = False
 
+from base_veo_video_generator import VIDEO_GRID_PARAMS, BaseVeoVideoGenerator
 from googleai_utils import GoogleAuthHelper, detect_image_mime_from_bytes
 
-logger = logging.getLogger("griptape_nodes_library_googleai")
-
 MODELS = [
     "veo-3.1-generate-001",
     "veo-3.1-fast-generate-001",
@@ -68,8 +63,14 @@ MODEL_CAPABILITIES = {
     },
 }
 
+# Per-model (show_last_frame, duration_choices, duration_default), resolved once at import
+MODEL_VISIBILITY: dict[str, tuple[bool, list[int], int]] = {
+    model: (capabilities["supports_last_frame"], capabilities["duration_choices"], capabilities["duration_default"])
+    for model, capabilities in MODEL_CAPABILITIES.items()
+}
+
 
-class VeoImageToVideoGenerator(ControlNode):
+class VeoImageToVideoGenerator(BaseVeoVideoGenerator):
     # Service constants for configuration
     SERVICE = "GoogleAI"
 
@@ -291,24 +292,19 @@ class VeoImageToVideoGenerator(ControlNode):
 
     def _update_parameter_visibility_for_model(self, model: str) -> None:
         """Update parameter visibility and options based on the selected model."""
-        if model not in MODEL_CAPABILITIES:
+        visibility = MODEL_VISIBILITY.get(model)
+        if visibility is None:
             return
-
-        capabilities = MODEL_CAPABILITIES[model]
+        show_last_frame, duration_choices, duration_default = visibility
 
         # Update last_frame visibility
-        if capabilities["supports_last_frame"]:
-            self.show_parameter_by_name("last_frame")
-        else:
-            self.hide_parameter_by_name("last_frame")
+        (self.show_parameter_by_name if show_last_frame else self.hide_parameter_by_name)("last_frame")
 
-        # Update duration choices
+        # Update duration choices, falling back to the default if the current value is not offered
         current_duration = self.get_parameter_value("duration")
-        if current_duration in capabilities["duration_choices"]:
-            self._update_option_choices("duration", capabilities["duration_choices"], current_duration)
-        else:
-            # Set to default if current value is not in new choices
-            self._update_option_choices("duration", capabilities["duration_choices"], capabilities["duration_default"])
+        if current_duration not in duration_choices:
+            current_duration = duration_default
+        self._update_option_choices("duration", duration_choices, current_duration)
 
     def _update_video_output_visibility(self, num_videos: int) -> None:
         """Update video output parameter visibility based on number of videos."""
@@ -358,22 +354,12 @@ class VeoImageToVideoGenerator(ControlNode):
         self._seed_parameter.after_value_set(parameter, value)
         return super().after_value_set(parameter, value)
 
-    def _log(self, message: str):
-        """Append a message to the logs output parameter."""
-        logger.info(message)
-        self.append_value_to_parameter("logs", message + "\n")
+    def _get_image_bytes(self, image_artifact) -> tuple[bytes, str]:
+        """Load an image artifact's raw bytes and return them with the mime type.
 
-    def _reset_outputs(self) -> None:
-        """Clear output parameters so stale values don't persist across re-adds/reruns."""
-        try:
-            self.parameter_output_values["logs"] = ""
-        except Exception:
-            # Be defensive if the base class changes how outputs are stored
-            pass
-
-    def _get_image_base64(self, image_artifact) -> tuple[str, str]:
-        """Convert image artifact to base64 string and return base64 data and mime type."""
-        self._log("🖼️ Converting image to base64...")
+        The google-genai SDK base64-encodes ``Image.image_bytes`` on the wire, so no local encode is needed.
+        """
+        self._log("🖼️ Loading image bytes...")
 
         # Get image data based on artifact type
         if isinstance(image_artifact, ImageUrlArtifact):
@@ -393,63 +379,29 @@ class VeoImageToVideoGenerator(ControlNode):
                 mime_type = detect_image_mime_from_bytes(image_data) or "image/png"
 
         elif isinstance(image_artifact, ImageArtifact):
-            # Handle ImageArtifact
-            if hasattr(image_artifact, "value") and hasattr(image_artifact.value, "read"):
-                # If it's a file-like object
-                image_data = image_artifact.value.read()
-            elif hasattr(image_artifact, "base64"):
-                # If it's already base64 encoded, return it directly
-                return image_artifact.base64, "image/png"
-            else:
-                # Try to get the raw value
-                image_data = image_artifact.value
+            # File-like values are read; otherwise the value already holds the raw image bytes
+            value = image_artifact.value
+            image_data = value.read() if hasattr(value, "read") else value
 
             # Detect mime type from bytes
             mime_type = detect_image_mime_from_bytes(image_data) or "image/png"
         else:
             raise ValueError(f"Unsupported image artifact type: {type(image_artifact)}")
 
-        # Convert to base64
-        import base64
-
-        base64_data = base64.b64encode(image_data).decode("utf-8")
-
-        self._log(f"✅ Image converted to base64 ({len(base64_data)} characters)")
-
-        return base64_data, mime_type
-
-    def _download_from_gcs(self, gcs_uri: str, project_id: str, credentials) -> bytes:
-        """Download video from GCS URI and return bytes."""
-        self._log(f"📥 Downloading from GCS URI: {gcs_uri}")
+        self._log(f"✅ Image loaded ({len(image_data)} bytes)")
 
-        if not gcs_uri.startswith("gs://"):
-            raise ValueError(f"Invalid GCS URI: {gcs_uri}")
-
-        path_parts = gcs_uri[5:].split("/", 1)
-        bucket_name = path_parts[0]
-        blob_path = path_parts[1]
-
-        storage_client = storage.Client(project=project_id, credentials=credentials)
-
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-
-        return blob.download_as_bytes()
+        return image_data, mime_type
 
     def _poll_and_process_video_result(self, client, operation, final_project_id, credentials) -> None:
         """Poll for video generation completion and process results - called via yield."""
         try:
-            # Poll for completion
-            while not operation.done:
-                time.sleep(15)
-                operation = client.operations.get(operation)
-                self._log("⏳ Still generating...")
+            operation = self._wait_for_operation(client, operation)
 
             self._log("✅ Video generation completed!")
 
             # Check for errors first
-            if hasattr(operation, "error") and operation.error:
-                error_details = operation.error
+            error_details = getattr(operation, "error", None)
+            if error_details:
                 self._log(f"❌ Video generation failed with error: {error_details}")
 
                 # Provide user-friendly error explanation
@@ -460,94 +412,58 @@ class VeoImageToVideoGenerator(ControlNode):
                     )
                 return
 
-            if not hasattr(operation, "response") or not operation.response:
-                self._log("❌ Video generation completed but no response found.")
-                return
-
-            video_artifacts = []
-            # Fix: videos are in operation.response, not operation.result
-            generated_videos = operation.response.generated_videos if operation.response else None
-
-            # Check for content filtering
-            if operation.response and hasattr(operation.response, "rai_media_filtered_count"):
-                filtered_count = operation.response.rai_media_filtered_count
-                if filtered_count > 0:
-                    self._log(f"🚫 Content Filter: {filtered_count} video(s) were filtered by Google's content policy.")
-                    if (
-                        hasattr(operation.response, "rai_media_filtered_reasons")
-                        and operation.response.rai_media_filtered_reasons
-                    ):
-                        for reason in operation.response.rai_media_filtered_reasons:
-                            self._log(f"   Reason: {reason}")
-                    self._log("💡 Tip: Try rephrasing your prompt to avoid violent, sexual, or harmful content.")
-                    return
-
+            generated_videos = self._get_generated_videos(operation)
             if not generated_videos:
-                self._log("❌ No videos found in the response.")
                 return
 
-            self._log(f"🎯 Generated {len(generated_videos)} video(s)")
-
+            # One slot per generated video, filled in generation order by index
+            saved_artifacts: list[VideoUrlArtifact | None] = [None] * len(generated_videos)
+            gcs_uris: dict[int, str] = {}
             for i, video in enumerate(generated_videos):
                 self._log(f"Processing video {i + 1}...")
                 video_bytes = None
+                video_file = getattr(video, "video", None)
+                inline_bytes = getattr(video_file, "video_bytes", None)
+                uri = getattr(video_file, "uri", None)
 
                 # Check for direct video bytes
-                if hasattr(video.video, "video_bytes") and video.video.video_bytes:
+                if inline_bytes:
                     self._log(f"💾 Video {i + 1} returned as direct bytes.")
-                    video_bytes = video.video.video_bytes
-                # Fallback to downloading from GCS URI
-                elif hasattr(video.video, "uri") and video.video.uri:
+                    video_bytes = inline_bytes
+                # Fallback to downloading from GCS URI (fetched concurrently below)
+                elif uri:
                     self._log(f"📹 Video {i + 1} has GCS URI. Downloading...")
-                    video_bytes = self._download_from_gcs(video.video.uri, final_project_id, credentials)
+                    gcs_uris[i] = uri
+                    continue
                 # Fallback to Files API (Veo 3.1 returns a File handle)
-                elif hasattr(video, "video") and video.video is not None:
+                elif video_file is not None:
                     try:
                         self._log(f"📦 Video {i + 1} is a file handle. Downloading via Files API...")
-                        # Download the file handle so it can be saved locally
-                        client.files.download(file=video.video)
-                        import tempfile
-
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp4") as tmp_file:
-                            tmp_path = tmp_file.name
-                        # Save the downloaded handle to disk, then read bytes
-                        video.video.save(tmp_path)
-                        with open(tmp_path, "rb") as f:
-                            video_bytes = f.read()
-                        os.remove(tmp_path)
+                        # files.download returns the payload (and fills video_bytes on the handle), so it can
+                        # go straight to project storage without a round trip through a temporary file
+                        video_bytes = client.files.download(file=video_file)
                     except Exception as e:
                         self._log(f"❌ Failed to download file handle for video {i + 1}: {e}")
 
-                if video_bytes:
-                    self._log(f"Saving video {i + 1} bytes to project storage...")
+                saved_artifacts[i] = self._save_video(i, video_bytes)
 
-                    saved = self._output_file.build_file().write_bytes(video_bytes)
+            if gcs_uris:
+                self._save_gcs_videos(gcs_uris, saved_artifacts, final_project_id, credentials)
 
-                    url_artifact = VideoUrlArtifact(value=saved.location, name=saved.location)
-                    video_artifacts.append(url_artifact)
-                    self._log(f"✅ Video {i + 1} saved. URL: {saved.location}")
-                else:
-                    self._log(f"❌ Could not retrieve video data for video {i + 1}.")
+            video_artifacts = [artifact for artifact in saved_artifacts if artifact is not None]
 
             if video_artifacts:
-                # Set the entire list of videos at once for grid display
-                self.parameter_output_values["video_artifacts"] = video_artifacts
-                # Proactively publish update to refresh UI
-                try:
-                    self.publish_update_to_parameter("video_artifacts", video_artifacts)
-                except Exception:
-                    pass
-
-                # Assign each video to its individual grid position output
-                for i, video in enumerate(video_artifacts):
-                    row = (i // 2) + 1  # Row: 1, 1, 2, 2
-                    col = (i % 2) + 1  # Col: 1, 2, 1, 2
-                    param_name = f"video_{row}_{col}"
-                    self.parameter_output_values[param_name] = video
+                # Set the grid list and each individual grid position output in a single update
+                grid_outputs = dict(zip(VIDEO_GRID_PARAMS, video_artifacts, strict=False))
+                outputs = {"video_artifacts": video_artifacts, **grid_outputs}
+                self.parameter_output_values.update(outputs)
+                for i, param_name in enumerate(grid_outputs):
                     self._log(f"📍 Assigned video {i + 1} to grid position {param_name}")
-                    # Publish each individual param to help UI binders update
+
+                # Proactively publish each output to help UI binders refresh
+                for param_name, value in outputs.items():
                     try:
-                        self.publish_update_to_parameter(param_name, video)
+                        self.publish_update_to_parameter(param_name, value)
                     except Exception:
                         pass
 
@@ -556,10 +472,10 @@ class VeoImageToVideoGenerator(ControlNode):
                 self._log("\n❌ No videos were successfully saved.")
         except Exception as e:
             self._log(f"❌ An unexpected error occurred during polling: {e}")
-            import traceback
-
             self._log(traceback.format_exc())
             raise
+        finally:
+            self._flush_logs()
 
     def process(self) -> AsyncResult:
         # Clear outputs at the start of each run
@@ -569,6 +485,7 @@ class VeoImageToVideoGenerator(ControlNode):
             self._log(
                 "ERROR: Required Google libraries are not installed. Please add 'google-auth', 'google-cloud-aiplatform', 'google-cloud-storage', 'google-genai' to your library's dependencies."
             )
+            self._flush_logs()
             return
             yield  # unreachable but makes the function a generator
 
@@ -606,11 +523,13 @@ class VeoImageToVideoGenerator(ControlNode):
                     raise ValueError("Dict does not contain valid image artifact data")
             except Exception as e:
                 self._log(f"ERROR: Failed to convert dict to image artifact: {e}")
+                self._flush_logs()
                 return
 
         # Validate inputs
         if not image_artifact:
             self._log("ERROR: Image is a required input.")
+            self._flush_logs()
             return
 
         # Handle dict input for last_frame if present
@@ -635,21 +554,21 @@ class VeoImageToVideoGenerator(ControlNode):
 
             self._log(f"Project ID: {final_project_id}")
             self._log("Initializing Vertex AI...")
-            aiplatform.init(project=final_project_id, location=location, credentials=credentials)
+            self._init_aiplatform(final_project_id, location, credentials)
 
             self._log("Initializing Generative AI Client...")
-            client = genai.Client(vertexai=True, project=final_project_id, location=location, credentials=credentials)
+            client = self._get_genai_client(final_project_id, location, credentials)
 
-            # Convert image to base64
-            base64_data, mime_type = self._get_image_base64(image_artifact)
+            # Load the raw image bytes; the SDK handles the wire encoding
+            image_data, mime_type = self._get_image_bytes(image_artifact)
 
             # Optional: last frame (check model capabilities)
-            base64_last_frame = None
+            last_frame_data = None
             mime_last_frame = None
             capabilities = MODEL_CAPABILITIES.get(model, {})
             if last_frame_artifact and capabilities.get("supports_last_frame", False):
                 self._log("🪄 Using last_frame for interpolation...")
-                base64_last_frame, mime_last_frame = self._get_image_base64(last_frame_artifact)
+                last_frame_data, mime_last_frame = self._get_image_bytes(last_frame_artifact)
 
             self._log(f"🎬 Generating video from image with prompt: '{prompt or 'No prompt provided'}'")
 
@@ -666,9 +585,9 @@ class VeoImageToVideoGenerator(ControlNode):
                 config_kwargs["duration_seconds"] = duration
 
             # Add last_frame if provided and supported
-            if base64_last_frame and mime_last_frame:
+            if last_frame_data and mime_last_frame:
                 config_kwargs["last_frame"] = Image(
-                    image_bytes=base64_last_frame,
+                    image_bytes=last_frame_data,
                     mime_type=mime_last_frame,
                 )
 
@@ -691,7 +610,7 @@ class VeoImageToVideoGenerator(ControlNode):
             api_params = {
                 "model": model,
                 "image": Image(
-                    image_bytes=base64_data,
+                    image_bytes=image_data,
                     mime_type=mime_type,
                 ),
                 "config": config,
@@ -706,6 +625,7 @@ class VeoImageToVideoGenerator(ControlNode):
             self._log("⏳ Operation started! Waiting for completion...")
 
             # Use yield pattern for non-blocking execution
+            self._flush_logs()
             yield lambda: self._poll_and_process_video_result(client, operation, final_project_id, credentials)
 
         except ValueError as e:
@@ -716,6 +636,6 @@ class VeoImageToVideoGenerator(ControlNode):
             self._log("   - OR GOOGLE_CLOUD_PROJECT_ID + GOOGLE_APPLICATION_CREDENTIALS_JSON")
         except Exception as e:
             self._log(f"❌ An unexpected error occurred: {e}")
-            import traceback
-
             self._log(traceback.format_exc())
+        finally:
+            self._flush_logs()
@@ -1,10 +1,10 @@
-import logging
-import time
-from typing import Any, ClassVar
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 from griptape.artifacts import ImageArtifact, ImageUrlArtifact, VideoUrlArtifact
 from griptape_nodes.exe_types.core_types import Parameter, ParameterGroup, ParameterMessage, ParameterMode
-from griptape_nodes.exe_types.node_types import AsyncResult, ControlNode
+from griptape_nodes.exe_types.node_types import AsyncResult
 from griptape_nodes.exe_types.param_components.project_file_parameter import ProjectFileParameter
 from griptape_nodes.exe_types.param_components.seed_parameter import SeedParameter
 from griptape_nodes.exe_types.param_types.parameter_bool import ParameterBool
@@ -17,19 +17,16 @@ from griptape_nodes.traits.options import Options
 
 # Attempt to import Google libraries
 try:
-    from google import genai
-    from google.cloud import aiplatform, storage
     from google.genai.types import GenerateVideosConfig, Image, VideoGenerationReferenceImage
 
     GOOGLE_INSTALLED = True
 except ImportError:
     GOOGLE_INSTALLED = False
 
+from base_veo_video_generator import VIDEO_GRID_PARAMS, BaseVeoVideoGenerator
 from googleai_utils import GoogleAuthHelper, detect_image_mime_from_bytes
 from griptape_nodes.files.file import File
 
-logger = logging.getLogger("griptape_nodes_library_googleai")
-
 # Only models that support reference images
 MODELS = [
     "veo-3.1-generate-001",
@@ -60,14 +57,24 @@ MODEL_CAPABILITIES = {
     },
 }
 
+# Optional reference image inputs, shown only for models accepting more than one reference
+EXTRA_REFERENCE_IMAGE_PARAMS = ("reference_image_2", "reference_image_3")
+
+
+def _reference_image_from_dict(data: dict) -> Any:
+    """Rebuild an ImageUrlArtifact from a serialized reference image; dicts without a value pass through."""
+    if data.get("type") == "ImageUrlArtifact" or "value" in data:
+        return ImageUrlArtifact(value=data.get("value"))
+    return data
 
-class VeoTextToVideoWithRef(ControlNode):
-    # Class-level cache for GCS clients
-    _gcs_client_cache: ClassVar[dict[str, Any]] = {}
 
+class VeoTextToVideoWithRef(BaseVeoVideoGenerator):
     # Service constants for configuration
     SERVICE = "GoogleAI"
 
+    # First backoff delay when polling the generation operation (overrides the 2s shared default)
+    POLL_BASE_DELAY_SECONDS = 3.0
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.category = "Google AI"
@@ -309,34 +316,31 @@ class VeoTextToVideoWithRef(ControlNode):
 
         # Initialize reference image visibility based on default model
         default_model = self.get_parameter_value("model") or MODELS[0]
-        self._update_reference_image_visibility_for_model(default_model)
-        self._update_generate_audio_visibility_for_model(default_model)
-
-    def _update_reference_image_visibility_for_model(self, model: str) -> None:
-        """Update reference image visibility based on the selected model."""
-        if model not in MODEL_CAPABILITIES:
+        capabilities = MODEL_CAPABILITIES.get(default_model)
+        if capabilities is not None:
+            self._update_reference_image_visibility_from_caps(capabilities)
+            self._update_generate_audio_visibility_from_caps(capabilities)
+
+    def _apply_model_capabilities(self, model: str) -> None:
+        """Resolve capabilities for the selected model once and apply all dependent UI updates."""
+        capabilities = MODEL_CAPABILITIES.get(model)
+        if capabilities is None:
             return
 
-        capabilities = MODEL_CAPABILITIES[model]
-        max_refs = capabilities.get("max_reference_images", 0)
-
-        # Always show first reference image (required)
-        self.show_parameter_by_name("reference_image_1")
-
-        # Show/hide additional reference images based on max count
-        if max_refs >= 3:
-            self.show_parameter_by_name("reference_image_2")
-            self.show_parameter_by_name("reference_image_3")
-        else:
-            self.hide_parameter_by_name("reference_image_2")
-            self.hide_parameter_by_name("reference_image_3")
+        self._update_duration_choices_from_caps(capabilities)
+        self._update_reference_image_visibility_from_caps(capabilities)
+        self._update_generate_audio_visibility_from_caps(capabilities)
 
-    def _update_generate_audio_visibility_for_model(self, model: str) -> None:
-        """Update generate_audio visibility based on the selected model (Veo 3 only)."""
-        if model not in MODEL_CAPABILITIES:
-            return
+    def _update_reference_image_visibility_from_caps(self, capabilities: dict[str, Any]) -> None:
+        """Update reference image visibility based on the model capabilities."""
+        # reference_image_1 is required and never hidden; only the optional ones depend on the model
+        max_refs = capabilities.get("max_reference_images", 0)
+        set_visibility = self.show_parameter_by_name if max_refs >= 3 else self.hide_parameter_by_name
+        for param_name in EXTRA_REFERENCE_IMAGE_PARAMS:
+            set_visibility(param_name)
 
-        capabilities = MODEL_CAPABILITIES[model]
+    def _update_generate_audio_visibility_from_caps(self, capabilities: dict[str, Any]) -> None:
+        """Update generate_audio visibility based on the model capabilities (Veo 3 only)."""
         version = capabilities.get("version", "")
 
         # Only show generate_audio for Veo 3 models
@@ -345,12 +349,8 @@ class VeoTextToVideoWithRef(ControlNode):
         else:
             self.hide_parameter_by_name("generate_audio")
 
-    def _update_duration_choices_for_model(self, model: str) -> None:
-        """Update duration choices based on the selected model."""
-        if model not in MODEL_CAPABILITIES:
-            return
-
-        capabilities = MODEL_CAPABILITIES[model]
+    def _update_duration_choices_from_caps(self, capabilities: dict[str, Any]) -> None:
+        """Update duration choices based on the model capabilities."""
         current_duration = self.get_parameter_value("duration")
         if current_duration in capabilities["duration_choices"]:
             self._update_option_choices("duration", capabilities["duration_choices"], current_duration)
@@ -398,9 +398,7 @@ class VeoTextToVideoWithRef(ControlNode):
     def after_value_set(self, parameter: Parameter, value: Any) -> None:
         """Handle parameter value changes."""
         if parameter.name == "model":
-            self._update_duration_choices_for_model(value)
-            self._update_reference_image_visibility_for_model(value)
-            self._update_generate_audio_visibility_for_model(value)
+            self._apply_model_capabilities(value)
             if value not in DEPRECATED_MODELS:
                 self.hide_message_by_name("model_deprecation_notice")
         elif parameter.name == "number_of_videos":
@@ -408,168 +406,94 @@ class VeoTextToVideoWithRef(ControlNode):
         self._seed_parameter.after_value_set(parameter, value)
         return super().after_value_set(parameter, value)
 
-    def _log(self, message: str):
-        """Append a message to the logs output parameter."""
-        logger.info(message)
-        self.append_value_to_parameter("logs", message + "\n")
-
-    def _reset_outputs(self) -> None:
-        """Clear output parameters so stale values don't persist across re-adds/reruns."""
-        try:
-            self.parameter_output_values["logs"] = ""
-        except Exception:
-            # Be defensive if the base class changes how outputs are stored
-            pass
+    def _get_image_bytes(self, image_artifact) -> tuple[bytes, str]:
+        """Load an image artifact's raw bytes and return them with the mime type.
 
-    def _get_image_base64(self, image_artifact) -> tuple[str, str]:
-        """Convert image artifact to base64 string and return base64 data and mime type."""
-        self._log("🖼️ Converting image to base64...")
+        The google-genai SDK base64-encodes ``Image.image_bytes`` on the wire, so no local encode is needed.
+        """
+        self._log("🖼️ Loading image bytes...")
 
         # Get image data based on artifact type
         if isinstance(image_artifact, ImageUrlArtifact):
             # Download image from URL
             self._log(f"📥 Downloading image from URL: {image_artifact.value}")
             image_data = File(image_artifact.value).read_bytes()
-            mime_type = detect_image_mime_from_bytes(image_data) or "image/png"
-
         elif isinstance(image_artifact, ImageArtifact):
-            # Handle ImageArtifact
-            if hasattr(image_artifact, "value") and hasattr(image_artifact.value, "read"):
-                # If it's a file-like object
-                image_data = image_artifact.value.read()
-            elif hasattr(image_artifact, "base64"):
-                # If it's already base64 encoded, return it directly
-                return image_artifact.base64, "image/png"
-            else:
-                # Try to get the raw value
-                image_data = image_artifact.value
-
-            # Detect mime type from bytes
-            mime_type = detect_image_mime_from_bytes(image_data) or "image/png"
+            # File-like values are read; otherwise the value already holds the raw image bytes
+            value = image_artifact.value
+            image_data = value.read() if hasattr(value, "read") else value
         else:
             raise ValueError(f"Unsupported image artifact type: {type(image_artifact)}")
 
-        # Convert to base64
-        import base64
-
-        base64_data = base64.b64encode(image_data).decode("utf-8")
-
-        self._log(f"✅ Image converted to base64 ({len(base64_data)} characters)")
-
-        return base64_data, mime_type
-
-    def _get_gcs_client(self, project_id: str, credentials):
-        """Get a cached or new GCS client."""
-        if project_id in self._gcs_client_cache:
-            return self._gcs_client_cache[project_id]
-        client = storage.Client(project=project_id, credentials=credentials)
-        self._gcs_client_cache[project_id] = client
-        return client
+        # Detect mime type from bytes
+        mime_type = detect_image_mime_from_bytes(image_data) or "image/png"
 
-    def _download_from_gcs(self, gcs_uri: str, project_id: str, credentials) -> bytes:
-        """Download video from GCS URI and return bytes."""
-        self._log(f"📥 Downloading from GCS URI: {gcs_uri}")
+        self._log(f"✅ Image loaded ({len(image_data)} bytes)")
 
-        if not gcs_uri.startswith("gs://"):
-            raise ValueError(f"Invalid GCS URI: {gcs_uri}")
+        return image_data, mime_type
 
-        path_parts = gcs_uri[5:].split("/", 1)
-        bucket_name = path_parts[0]
-        blob_path = path_parts[1]
-
-        storage_client = self._get_gcs_client(project_id, credentials)
-
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-
-        return blob.download_as_bytes()
+    def _try_get_image_bytes(self, image_artifact) -> tuple[bytes, str] | None:
+        """Load a reference image's bytes, logging and returning None on failure."""
+        try:
+            return self._get_image_bytes(image_artifact)
+        except Exception as e:
+            self._log(f"⚠️ Failed to process reference image: {e}")
+            return None
 
     def _poll_and_process_video_result(self, client, operation, final_project_id, credentials) -> None:
         """Poll for video generation completion and process results - called via yield."""
         try:
-            # Poll for completion
-            while not operation.done:
-                time.sleep(15)
-                operation = client.operations.get(operation)
-                self._log("⏳ Still generating...")
+            operation = self._wait_for_operation(client, operation)
 
             self._log("✅ Video generation completed!")
 
-            if hasattr(operation, "error") and operation.error:
-                self._log(f"❌ Operation has error: {operation.error}")
+            error = getattr(operation, "error", None)
+            if error:
+                self._log(f"❌ Operation has error: {error}")
                 return
 
-            if not operation.response:
-                self._log("❌ Video generation completed but no response found.")
-                return
-
-            video_artifacts = []
-            # Fix: videos are in operation.response, not operation.result
-            generated_videos = operation.response.generated_videos if operation.response else None
-
-            # Check for content filtering
-            if operation.response and hasattr(operation.response, "rai_media_filtered_count"):
-                filtered_count = operation.response.rai_media_filtered_count
-                if filtered_count > 0:
-                    self._log(f"🚫 Content Filter: {filtered_count} video(s) were filtered by Google's content policy.")
-                    if (
-                        hasattr(operation.response, "rai_media_filtered_reasons")
-                        and operation.response.rai_media_filtered_reasons
-                    ):
-                        for reason in operation.response.rai_media_filtered_reasons:
-                            self._log(f"   Reason: {reason}")
-                    self._log("💡 Tip: Try rephrasing your prompt to avoid violent, sexual, or harmful content.")
-                    return
-
+            generated_videos = self._get_generated_videos(operation)
             if not generated_videos:
-                self._log("❌ No videos found in the response.")
                 return
 
-            self._log(f"🎯 Generated {len(generated_videos)} video(s)")
-
+            # One slot per generated video, filled in generation order by index
+            saved_artifacts: list[VideoUrlArtifact | None] = [None] * len(generated_videos)
+            gcs_uris: dict[int, str] = {}
             for i, video in enumerate(generated_videos):
                 self._log(f"Processing video {i + 1}...")
                 video_bytes = None
+                inline_bytes = getattr(video.video, "video_bytes", None)
+                uri = getattr(video.video, "uri", None)
 
                 # Check for direct video bytes
-                if hasattr(video.video, "video_bytes") and video.video.video_bytes:
+                if inline_bytes:
                     self._log(f"💾 Video {i + 1} returned as direct bytes.")
-                    video_bytes = video.video.video_bytes
-                # Fallback to downloading from GCS URI
-                elif hasattr(video.video, "uri") and video.video.uri:
+                    video_bytes = inline_bytes
+                # Fallback to downloading from GCS URI (fetched concurrently below)
+                elif uri:
                     self._log(f"📹 Video {i + 1} has GCS URI. Downloading...")
-                    video_bytes = self._download_from_gcs(video.video.uri, final_project_id, credentials)
+                    gcs_uris[i] = uri
+                    continue
 
-                if video_bytes:
-                    self._log(f"Saving video {i + 1} bytes to project storage...")
+                saved_artifacts[i] = self._save_video(i, video_bytes)
 
-                    saved = self._output_file.build_file().write_bytes(video_bytes)
+            if gcs_uris:
+                self._save_gcs_videos(gcs_uris, saved_artifacts, final_project_id, credentials)
 
-                    url_artifact = VideoUrlArtifact(value=saved.location, name=saved.location)
-                    video_artifacts.append(url_artifact)
-                    self._log(f"✅ Video {i + 1} saved. URL: {saved.location}")
-                else:
-                    self._log(f"❌ Could not retrieve video data for video {i + 1}.")
+            video_artifacts = [artifact for artifact in saved_artifacts if artifact is not None]
 
             if video_artifacts:
-                # Set the entire list of videos at once for grid display
-                self.parameter_output_values["video_artifacts"] = video_artifacts
-                # Proactively publish update to refresh UI
-                try:
-                    self.publish_update_to_parameter("video_artifacts", video_artifacts)
-                except Exception:
-                    pass
-
-                # Assign each video to its individual grid position output
-                for i, video in enumerate(video_artifacts):
-                    row = (i // 2) + 1  # Row: 1, 1, 2, 2
-                    col = (i % 2) + 1  # Col: 1, 2, 1, 2
-                    param_name = f"video_{row}_{col}"
-                    self.parameter_output_values[param_name] = video
+                # Set the grid list and each individual grid position output in a single update
+                grid_outputs = dict(zip(VIDEO_GRID_PARAMS, video_artifacts, strict=False))
+                outputs = {"video_artifacts": video_artifacts, **grid_outputs}
+                self.parameter_output_values.update(outputs)
+                for i, param_name in enumerate(grid_outputs):
                     self._log(f"📍 Assigned video {i + 1} to grid position {param_name}")
-                    # Publish each individual param to help UI binders update
+
+                # Proactively publish each output to help UI binders refresh
+                for param_name, value in outputs.items():
                     try:
-                        self.publish_update_to_parameter(param_name, video)
+                        self.publish_update_to_parameter(param_name, value)
                     except Exception:
                         pass
 
@@ -578,10 +502,10 @@ class VeoTextToVideoWithRef(ControlNode):
                 self._log("\n❌ No videos were successfully saved.")
         except Exception as e:
             self._log(f"❌ An unexpected error occurred during polling: {e}")
-            import traceback
-
             self._log(traceback.format_exc())
             raise
+        finally:
+            self._flush_logs()
 
     def process(self) -> AsyncResult:
         # Clear outputs at the start of each run
@@ -591,6 +515,7 @@ class VeoTextToVideoWithRef(ControlNode):
             self._log(
                 "ERROR: Required Google libraries are not installed. Please add 'google-auth', 'google-cloud-aiplatform', 'google-cloud-storage', 'google-genai' to your library's dependencies."
             )
+            self._flush_logs()
             return
             yield  # unreachable but makes the function a generator
 
@@ -607,17 +532,25 @@ class VeoTextToVideoWithRef(ControlNode):
         num_videos = self.get_parameter_value("number_of_videos")
         location = self.get_parameter_value("location")
         reference_image_1 = self.get_parameter_value("reference_image_1")
-        reference_image_2 = self.get_parameter_value("reference_image_2")
-        reference_image_3 = self.get_parameter_value("reference_image_3")
-        reference_type = self.get_parameter_value("reference_type") or "asset"
+
+        # Resolve model capabilities once; optional inputs are only read when the model uses them
+        capabilities = MODEL_CAPABILITIES.get(model, {})
+        max_refs = capabilities.get("max_reference_images", 0)
+        supports_type_choice = capabilities.get("supports_reference_type_choice", False)
+        extra_reference_images = []
+        if max_refs >= 3:
+            extra_reference_images = [self.get_parameter_value(name) for name in EXTRA_REFERENCE_IMAGE_PARAMS]
+        reference_type = (self.get_parameter_value("reference_type") or "asset") if supports_type_choice else "asset"
 
         # Validate inputs
         if not prompt:
             self._log("ERROR: Prompt is a required input.")
+            self._flush_logs()
             return
 
         if not reference_image_1:
             self._log("ERROR: At least one reference image is required.")
+            self._flush_logs()
             return
 
         try:
@@ -628,23 +561,16 @@ class VeoTextToVideoWithRef(ControlNode):
 
             self._log(f"Project ID: {final_project_id}")
             self._log("Initializing Vertex AI...")
-            aiplatform.init(project=final_project_id, location=location, credentials=credentials)
+            self._init_aiplatform(final_project_id, location, credentials)
 
             self._log("Initializing Generative AI Client...")
-            client = genai.Client(vertexai=True, project=final_project_id, location=location, credentials=credentials)
+            client = self._get_genai_client(final_project_id, location, credentials)
 
             # Process reference images
             reference_images = []
-            capabilities = MODEL_CAPABILITIES.get(model, {})
-            max_refs = capabilities.get("max_reference_images", 0)
-            supports_type_choice = capabilities.get("supports_reference_type_choice", False)
 
             # Collect reference images based on model capabilities
-            ref_image_list = [reference_image_1]
-            if max_refs >= 3 and reference_image_2:
-                ref_image_list.append(reference_image_2)
-            if max_refs >= 3 and reference_image_3:
-                ref_image_list.append(reference_image_3)
+            ref_image_list = [reference_image_1, *(image for image in extra_reference_images if image)]
 
             # Determine reference type
             if supports_type_choice:
@@ -659,35 +585,44 @@ class VeoTextToVideoWithRef(ControlNode):
 
             self._log(f"🖼️ Processing {len(ref_image_list)} reference image(s) with type '{ref_type}'...")
 
+            artifacts = []
             for ref_img in ref_image_list:
-                if not ref_img:
-                    continue
-
-                # Handle dict input
+                # Handle dict input (can happen after serialization/deserialization)
                 if isinstance(ref_img, dict):
                     try:
-                        if ref_img.get("type") == "ImageUrlArtifact":
-                            ref_img = ImageUrlArtifact(value=ref_img.get("value"))
-                        elif "value" in ref_img:
-                            ref_img = ImageUrlArtifact(value=ref_img["value"])
+                        ref_img = _reference_image_from_dict(ref_img)
                     except Exception as e:
                         self._log(f"⚠️ Failed to convert reference image dict: {e}")
                         continue
+                artifacts.append(ref_img)
+
+            # Load all reference images concurrently, keeping their input order. A URL used for more than
+            # one reference is fetched once; per-run only, since project files can be overwritten in place.
+            source_keys = [
+                artifact.value if isinstance(artifact, ImageUrlArtifact) else id(artifact) for artifact in artifacts
+            ]
+            unique_artifacts = dict(zip(source_keys, artifacts, strict=True))
+            if unique_artifacts:
+                with ThreadPoolExecutor(max_workers=len(unique_artifacts)) as executor:
+                    results = executor.map(self._try_get_image_bytes, unique_artifacts.values())
+                    loaded_by_key = dict(zip(unique_artifacts, results, strict=True))
+            else:
+                loaded_by_key = {}
+            loaded_images = [loaded_by_key[key] for key in source_keys]
 
-                try:
-                    ref_base64, ref_mime = self._get_image_base64(ref_img)
-                    reference_images.append(
-                        VideoGenerationReferenceImage(
-                            image=Image(
-                                image_bytes=ref_base64,
-                                mime_type=ref_mime,
-                            ),
-                            reference_type=ref_type,
-                        )
-                    )
-                except Exception as e:
-                    self._log(f"⚠️ Failed to process reference image: {e}")
+            for loaded in loaded_images:
+                if loaded is None:
                     continue
+                ref_bytes, ref_mime = loaded
+                reference_images.append(
+                    VideoGenerationReferenceImage(
+                        image=Image(
+                            image_bytes=ref_bytes,
+                            mime_type=ref_mime,
+                        ),
+                        reference_type=ref_type,
+                    )
+                )
 
             if reference_images:
                 self._log(f"✅ Processed {len(reference_images)} reference image(s) with type '{ref_type}'")
@@ -732,6 +667,7 @@ class VeoTextToVideoWithRef(ControlNode):
             self._log("⏳ Operation started! Waiting for completion...")
 
             # Use yield pattern for non-blocking execution
+            self._flush_logs()
             yield lambda: self._poll_and_process_video_result(client, operation, final_project_id, credentials)
 
         except ValueError as e:
@@ -742,6 +678,6 @@ class VeoTextToVideoWithRef(ControlNode):
             self._log("   - OR GOOGLE_CLOUD_PROJECT_ID + GOOGLE_APPLICATION_CREDENTIALS_JSON")
         except Exception as e:
             self._log(f"❌ An unexpected error occurred: {e}")
-            import traceback
-
             self._log(traceback.format_exc())
+        finally:
+            self._flush_logs()
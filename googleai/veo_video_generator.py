@@ -1,10 +1,9 @@
-import logging
-import time
-from typing import Any, ClassVar
+import traceback
+from typing import Any
 
 from griptape.artifacts import VideoUrlArtifact
 from griptape_nodes.exe_types.core_types import Parameter, ParameterGroup, ParameterMessage, ParameterMode
-from griptape_nodes.exe_types.node_types import AsyncResult, ControlNode
+from griptape_nodes.exe_types.node_types import AsyncResult
 from griptape_nodes.exe_types.param_components.project_file_parameter import ProjectFileParameter
 from griptape_nodes.exe_types.param_components.seed_parameter import SeedParameter
 from griptape_nodes.exe_types.param_types.parameter_bool import ParameterBool
@@ -16,18 +15,15 @@ from griptape_nodes.traits.options import Options
 
 # Attempt to import Google libraries
 try:
-    from google import genai
-    from google.cloud import aiplatform, storage
     from google.genai.types import GenerateVideosConfig
 
     GOOGLE_INSTALLED = True
 except ImportError:
     GOOGLE_INSTALLED = False
 
+from base_veo_video_generator import VIDEO_GRID, VIDEO_GRID_PARAMS, BaseVeoVideoGenerator
 from googleai_utils import GoogleAuthHelper
 
-logger = logging.getLogger("griptape_nodes_library_googleai")
-
 MODELS = [
     "veo-3.1-generate-001",
     "veo-3.1-fast-generate-001",
@@ -62,11 +58,18 @@ MODEL_CAPABILITIES = {
     },
 }
 
+# Per-model (duration_choices, duration_default), derived from MODEL_CAPABILITIES once at import time
+DURATION_BY_MODEL: dict[str, tuple[list[int], int]] = {
+    model: (capabilities["duration_choices"], capabilities["duration_default"])
+    for model, capabilities in MODEL_CAPABILITIES.items()
+}
+# Models that support generate_audio
+VEO3_MODELS = frozenset(
+    model for model, capabilities in MODEL_CAPABILITIES.items() if capabilities["version"] == "veo3"
+)
 
-class VeoVideoGenerator(ControlNode):
-    # Class-level cache for GCS clients
-    _gcs_client_cache: ClassVar[dict[str, Any]] = {}
 
+class VeoVideoGenerator(BaseVeoVideoGenerator):
     # Service constants for configuration
     SERVICE = "GoogleAI"
 
@@ -148,15 +151,14 @@ class VeoVideoGenerator(ControlNode):
         self._seed_parameter = SeedParameter(self)
         self._seed_parameter.add_input_parameters()
 
-        # Duration parameter (choices vary by model)
-        default_model = self.get_parameter_value("model") or MODELS[0]
-        default_capabilities = MODEL_CAPABILITIES.get(default_model, MODEL_CAPABILITIES[MODELS[0]])
+        # Duration parameter (choices vary by model; the model parameter starts at its default)
+        default_duration_choices, default_duration = DURATION_BY_MODEL[MODELS[0]]
         self.add_parameter(
             ParameterInt(
                 name="duration",
                 tooltip="Duration of the generated video in seconds.",
-                default_value=default_capabilities["duration_default"],
-                traits={Options(choices=default_capabilities["duration_choices"])},
+                default_value=default_duration,
+                traits={Options(choices=default_duration_choices)},
                 allow_output=False,
             )
         )
@@ -208,49 +210,20 @@ class VeoVideoGenerator(ControlNode):
 
         # Individual video output parameters for grid positions
         # Always add all 4, but hide 2-4 by default (shown when number_of_videos > 1)
-        self.add_parameter(
-            Parameter(
-                name="video_1_1",
-                type="VideoUrlArtifact",
-                output_type="VideoUrlArtifact",
-                tooltip="Video at grid position [1,1]",
-                ui_options={"hide_property": True},
-                allowed_modes={ParameterMode.OUTPUT},
-            )
-        )
-
-        self.add_parameter(
-            Parameter(
-                name="video_1_2",
-                type="VideoUrlArtifact",
-                output_type="VideoUrlArtifact",
-                tooltip="Video at grid position [1,2]",
-                ui_options={"hide_property": True, "hide_when": {"number_of_videos": [1]}},
-                allowed_modes={ParameterMode.OUTPUT},
-            )
-        )
-
-        self.add_parameter(
-            Parameter(
-                name="video_2_1",
-                type="VideoUrlArtifact",
-                output_type="VideoUrlArtifact",
-                tooltip="Video at grid position [2,1]",
-                ui_options={"hide_property": True, "hide_when": {"number_of_videos": [1, 2]}},
-                allowed_modes={ParameterMode.OUTPUT},
-            )
-        )
-
-        self.add_parameter(
-            Parameter(
-                name="video_2_2",
-                type="VideoUrlArtifact",
-                output_type="VideoUrlArtifact",
-                tooltip="Video at grid position [2,2]",
-                ui_options={"hide_property": True, "hide_when": {"number_of_videos": [1, 2, 3]}},
-                allowed_modes={ParameterMode.OUTPUT},
+        for param_name, row, col, hide_when in VIDEO_GRID:
+            ui_options: dict[str, Any] = {"hide_property": True}
+            if hide_when:
+                ui_options["hide_when"] = {"number_of_videos": list(hide_when)}
+            self.add_parameter(
+                Parameter(
+                    name=param_name,
+                    type="VideoUrlArtifact",
+                    output_type="VideoUrlArtifact",
+                    tooltip=f"Video at grid position [{row},{col}]",
+                    ui_options=ui_options,
+                    allowed_modes={ParameterMode.OUTPUT},
+                )
             )
-        )
 
         # Logs Group
         with ParameterGroup(name="Logs") as logs_group:
@@ -269,8 +242,7 @@ class VeoVideoGenerator(ControlNode):
         self._output_file.add_parameter()
 
         # Initialize duration choices based on default model
-        default_model = self.get_parameter_value("model") or MODELS[0]
-        self._update_duration_choices_for_model(default_model)
+        self._update_duration_choices_for_model(MODELS[0])
 
         # Initialize video output visibility based on default number of videos
         default_num_videos = self.get_parameter_value("number_of_videos") or 1
@@ -278,37 +250,26 @@ class VeoVideoGenerator(ControlNode):
 
     def _update_duration_choices_for_model(self, model: str) -> None:
         """Update duration choices based on the selected model."""
-        if model not in MODEL_CAPABILITIES:
+        durations = DURATION_BY_MODEL.get(model)
+        if durations is None:
             return
+        duration_choices, duration_default = durations
 
-        capabilities = MODEL_CAPABILITIES[model]
         current_duration = self.get_parameter_value("duration")
-        if current_duration in capabilities["duration_choices"]:
-            self._update_option_choices("duration", capabilities["duration_choices"], current_duration)
+        if current_duration in duration_choices:
+            self._update_option_choices("duration", duration_choices, current_duration)
         else:
             # Set to default if current value is not in new choices
-            self._update_option_choices("duration", capabilities["duration_choices"], capabilities["duration_default"])
+            self._update_option_choices("duration", duration_choices, duration_default)
 
     def _update_video_output_visibility(self, num_videos: int) -> None:
         """Update video output parameter visibility based on number of videos."""
-        # Always show video_1_1 (first video)
-        self.show_parameter_by_name("video_1_1")
-
-        # Show/hide additional videos based on count
-        if num_videos >= 2:
-            self.show_parameter_by_name("video_1_2")
-        else:
-            self.hide_parameter_by_name("video_1_2")
-
-        if num_videos >= 3:
-            self.show_parameter_by_name("video_2_1")
-        else:
-            self.hide_parameter_by_name("video_2_1")
-
-        if num_videos >= 4:
-            self.show_parameter_by_name("video_2_2")
-        else:
-            self.hide_parameter_by_name("video_2_2")
+        # Each grid slot is shown once num_videos reaches its position (number_of_videos is always 1-4)
+        for position, param_name in enumerate(VIDEO_GRID_PARAMS, start=1):
+            if num_videos >= position:
+                self.show_parameter_by_name(param_name)
+            else:
+                self.hide_parameter_by_name(param_name)
 
     def before_value_set(self, parameter: Parameter, value: Any) -> Any:
         """Auto-migrate deprecated models and show a deprecation notice."""
@@ -337,122 +298,52 @@ class VeoVideoGenerator(ControlNode):
         self._seed_parameter.after_value_set(parameter, value)
         return super().after_value_set(parameter, value)
 
-    def _log(self, message: str):
-        """Append a message to the logs output parameter."""
-        logger.info(message)
-        self.append_value_to_parameter("logs", message + "\n")
-
-    def _reset_outputs(self) -> None:
-        """Clear output parameters so stale values don't persist across re-adds/reruns."""
-        try:
-            self.parameter_output_values["logs"] = ""
-        except Exception:
-            # Be defensive if the base class changes how outputs are stored
-            pass
-
-    def _get_gcs_client(self, project_id: str, credentials):
-        """Get a cached or new GCS client."""
-        if project_id in self._gcs_client_cache:
-            return self._gcs_client_cache[project_id]
-        client = storage.Client(project=project_id, credentials=credentials)
-        self._gcs_client_cache[project_id] = client
-        return client
-
-    def _download_from_gcs(self, gcs_uri: str, project_id: str, credentials) -> bytes:
-        """Download video from GCS URI and return bytes."""
-        self._log(f"📥 Downloading from GCS URI: {gcs_uri}")
-
-        if not gcs_uri.startswith("gs://"):
-            raise ValueError(f"Invalid GCS URI: {gcs_uri}")
-
-        path_parts = gcs_uri[5:].split("/", 1)
-        bucket_name = path_parts[0]
-        blob_path = path_parts[1]
-
-        storage_client = self._get_gcs_client(project_id, credentials)
-
-        bucket = storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_path)
-
-        return blob.download_as_bytes()
-
     def _poll_and_process_video_result(self, client, operation, final_project_id, credentials) -> None:
         """Poll for video generation completion and process results - called via yield."""
         try:
-            # Poll for completion
-            while not operation.done:
-                time.sleep(15)
-                operation = client.operations.get(operation)
-                self._log("⏳ Still generating...")
+            operation = self._wait_for_operation(client, operation)
 
             self._log("✅ Video generation completed!")
 
-            if hasattr(operation, "error") and operation.error:
-                self._log(f"❌ Operation has error: {operation.error}")
+            error = getattr(operation, "error", None)
+            if error:
+                self._log(f"❌ Operation has error: {error}")
                 return
 
-            if not operation.response:
-                self._log("❌ Video generation completed but no response found.")
-                return
-
-            video_artifacts = []
-            # Fix: videos are in operation.response, not operation.result
-            generated_videos = operation.response.generated_videos if operation.response else None
-
-            # Check for content filtering
-            if operation.response and hasattr(operation.response, "rai_media_filtered_count"):
-                filtered_count = operation.response.rai_media_filtered_count
-                if filtered_count > 0:
-                    self._log(f"🚫 Content Filter: {filtered_count} video(s) were filtered by Google's content policy.")
-                    if (
-                        hasattr(operation.response, "rai_media_filtered_reasons")
-                        and operation.response.rai_media_filtered_reasons
-                    ):
-                        for reason in operation.response.rai_media_filtered_reasons:
-                            self._log(f"   Reason: {reason}")
-                    self._log("💡 Tip: Try rephrasing your prompt to avoid violent, sexual, or harmful content.")
-                    return
-
+            generated_videos = self._get_generated_videos(operation)
             if not generated_videos:
-                self._log("❌ No videos found in the response.")
                 return
 
-            self._log(f"🎯 Generated {len(generated_videos)} video(s)")
-
+            # One slot per generated video, filled in generation order by index
+            saved_artifacts: list[VideoUrlArtifact | None] = [None] * len(generated_videos)
+            gcs_uris: dict[int, str] = {}
             for i, video in enumerate(generated_videos):
                 self._log(f"Processing video {i + 1}...")
-                video_bytes = None
+
+                inline_bytes = getattr(video.video, "video_bytes", None)
+                uri = getattr(video.video, "uri", None)
 
                 # Check for direct video bytes
-                if hasattr(video.video, "video_bytes") and video.video.video_bytes:
+                if inline_bytes:
                     self._log(f"💾 Video {i + 1} returned as direct bytes.")
-                    video_bytes = video.video.video_bytes
+                    saved_artifacts[i] = self._save_video(i, inline_bytes)
                 # Fallback to downloading from GCS URI
-                elif hasattr(video.video, "uri") and video.video.uri:
+                elif uri:
                     self._log(f"📹 Video {i + 1} has GCS URI. Downloading...")
-                    video_bytes = self._download_from_gcs(video.video.uri, final_project_id, credentials)
-
-                if video_bytes:
-                    self._log(f"Saving video {i + 1} bytes to project storage...")
-
-                    saved = self._output_file.build_file().write_bytes(video_bytes)
-
-                    url_artifact = VideoUrlArtifact(value=saved.location, name=saved.location)
-                    video_artifacts.append(url_artifact)
-                    self._log(f"✅ Video {i + 1} saved. URL: {saved.location}")
+                    gcs_uris[i] = uri
                 else:
                     self._log(f"❌ Could not retrieve video data for video {i + 1}.")
 
+            if gcs_uris:
+                self._save_gcs_videos(gcs_uris, saved_artifacts, final_project_id, credentials)
+
+            video_artifacts = [artifact for artifact in saved_artifacts if artifact is not None]
+
             if video_artifacts:
-                # Set the entire list of videos at once for grid display
-                self.parameter_output_values["video_artifacts"] = video_artifacts
-
-                # Assign each video to its individual grid position output
-                for i, video in enumerate(video_artifacts):
-                    row = (i // 2) + 1  # Row: 1, 1, 2, 2
-                    col = (i % 2) + 1  # Col: 1, 2, 1, 2
-                    param_name = f"video_{row}_{col}"
-                    self.parameter_output_values[param_name] = video
+                # Set the grid list and each individual grid position output in a single update
+                grid_outputs = dict(zip(VIDEO_GRID_PARAMS, video_artifacts, strict=False))
+                self.parameter_output_values.update({"video_artifacts": video_artifacts, **grid_outputs})
+                for i, param_name in enumerate(grid_outputs):
                     self._log(f"📍 Assigned video {i + 1} to grid position {param_name}")
 
                 self._log("\n🎉 SUCCESS! All videos processed.")
@@ -460,10 +351,10 @@ class VeoVideoGenerator(ControlNode):
                 self._log("\n❌ No videos were successfully saved.")
         except Exception as e:
             self._log(f"❌ An unexpected error occurred during polling: {e}")
-            import traceback
-
             self._log(traceback.format_exc())
             raise
+        finally:
+            self._flush_logs()
 
     def process(self) -> AsyncResult:
         # Clear outputs at the start of each run
@@ -473,6 +364,7 @@ class VeoVideoGenerator(ControlNode):
             self._log(
                 "ERROR: Required Google libraries are not installed. Please add 'google-auth', 'google-cloud-aiplatform', 'google-cloud-storage', 'google-genai' to your library's dependencies."
             )
+            self._flush_logs()
             return
             yield  # unreachable but makes the function a generator
 
@@ -492,6 +384,7 @@ class VeoVideoGenerator(ControlNode):
         # Validate inputs
         if not prompt:
             self._log("ERROR: Prompt is a required input.")
+            self._flush_logs()
             return
 
         try:
@@ -502,35 +395,29 @@ class VeoVideoGenerator(ControlNode):
 
             self._log(f"Project ID: {final_project_id}")
             self._log("Initializing Vertex AI...")
-            aiplatform.init(project=final_project_id, location=location, credentials=credentials)
+            self._init_aiplatform(final_project_id, location, credentials)
 
             self._log("Initializing Generative AI Client...")
-            client = genai.Client(vertexai=True, project=final_project_id, location=location, credentials=credentials)
+            client = self._get_genai_client(final_project_id, location, credentials)
 
             self._log(f"🎬 Generating video for prompt: '{prompt}'")
 
-            # Build config
+            # Build config; optional fields are only sent when provided
+            optional_config = {
+                "duration_seconds": duration or None,
+                # generateAudio is only supported by Veo 3 models
+                "generate_audio": True if generate_audio and model in VEO3_MODELS else None,
+                "negative_prompt": negative_prompt or None,
+            }
             config_kwargs = {
                 "aspect_ratio": aspect_ratio,
                 "resolution": resolution,
                 "number_of_videos": num_videos,
+                # SeedParameter handles randomization logic
+                "seed": seed,
+                **{key: value for key, value in optional_config.items() if value is not None},
             }
 
-            # Add durationSeconds if provided
-            if duration:
-                config_kwargs["duration_seconds"] = duration
-
-            # Add generateAudio if provided (Veo 3 models only)
-            if generate_audio:
-                config_kwargs["generate_audio"] = True
-
-            # Add seed - SeedParameter handles randomization logic
-            config_kwargs["seed"] = seed
-
-            # Add negative prompt if provided - goes in config
-            if negative_prompt:
-                config_kwargs["negative_prompt"] = negative_prompt
-
             # Build API parameters
             api_params = {
                 "model": model,
@@ -543,6 +430,7 @@ class VeoVideoGenerator(ControlNode):
             self._log("⏳ Operation started! Waiting for completion...")
 
             # Use yield pattern for non-blocking execution
+            self._flush_logs()
             yield lambda: self._poll_and_process_video_result(client, operation, final_project_id, credentials)
 
         except ValueError as e:
@@ -553,6 +441,6 @@ class VeoVideoGenerator(ControlNode):
             self._log("   - OR GOOGLE_CLOUD_PROJECT_ID + GOOGLE_APPLICATION_CREDENTIALS_JSON")
         except Exception as e:
             self._log(f"❌ An unexpected error occurred: {e}")
-            import traceback
-
             self._log(traceback.format_exc())
+        finally:
+            self._flush_logs()
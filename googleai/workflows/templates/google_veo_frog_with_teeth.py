@@ -16,8 +16,6 @@
 #
 # ///
 
-import pickle
-
 from griptape_nodes.node_library.library_registry import NodeMetadata
 from griptape_nodes.retained_mode.events.connection_events import CreateConnectionRequest
 from griptape_nodes.retained_mode.events.flow_events import CreateFlowRequest
@@ -39,38 +37,21 @@ if not context_manager.has_current_workflow():
 1. We've collated all of the unique parameter values into a dictionary so that we do not have to duplicate them.
    This minimizes the size of the code, especially for large objects like serialized image files.
 2. We're using a prefix so that it's clear which Flow these values are associated with.
-3. The values are serialized using pickle, which is a binary format. This makes them harder to read, but makes
-   them consistently save and load. It allows us to serialize complex objects like custom classes, which otherwise
-   would be difficult to serialize.
+3. The values here are all plain strings and lists, so they are written as Python literals rather than pickled
+   blobs. Importing the template then needs no deserialization.
 """
 top_level_unique_values_dict = {
-    "b545fdac-c8b8-41ba-abb8-7860afc9e84c": pickle.loads(
-        b"\x80\x04\x95\x13\x00\x00\x00\x00\x00\x00\x00\x8c\x0fLocal Execution\x94."
-    ),
-    "1d9beaec-ec3e-4795-a74c-6d37e5f90813": pickle.loads(b"\x80\x04\x95\x04\x00\x00\x00\x00\x00\x00\x00\x8c\x00\x94."),
-    "4f6a996a-a34c-4201-a4a2-2df79b0d3682": pickle.loads(
-        b"\x80\x04\x95q\x00\x00\x00\x00\x00\x00\x00\x8cmThis workflow demonstrates the use of Reference Images for the Veo Text to Video (With Reference Images) node\x94."
-    ),
-    "541f3ffa-95a4-45bb-98eb-35483746b0e1": pickle.loads(
-        b"\x80\x04\x95N\x00\x00\x00\x00\x00\x00\x00\x8cJGenerate a video of the frog that takes into account the reference images.\x94."
-    ),
-    "1b171537-4b50-44f2-baef-d5da7e2370ca": pickle.loads(
-        b"\x80\x04\x95%\x00\x00\x00\x00\x00\x00\x00\x8c!Create the initial starting image\x94."
-    ),
-    "f7ff9c6b-37fc-4b82-8164-67928878c2e4": pickle.loads(
-        b"\x80\x04\x959\x00\x00\x00\x00\x00\x00\x00\x8c5Create something specific about the frog - like teeth\x94."
-    ),
-    "9b696160-12a6-4aef-a82a-23be280139d4": pickle.loads(
-        b"\x80\x04\x95\x1d\x02\x00\x00\x00\x00\x00\x00X\x16\x02\x00\x00Extreme close-up nighttime shot of a tiny green tree frog clinging to a translucent jungle leaf, illuminated by soft backlighting that highlights the intricate veins of the leaf. The frog's textured skin glistens with dew droplets, showcasing stunning detail and vibrant green tones. Dappled light filters through the dense, dark jungle environment, creating a dramatic and moody atmosphere. Foreground dust particles float gently, adding depth and realism to the scene. A composition worthy of an award-winning nature magazine cover.\x94."
-    ),
-    "90f10c8c-f1b1-4130-8046-156f7b01f30e": pickle.loads(b"\x80\x04]\x94."),
-    "04194d5a-968d-44c8-80e5-301a2000b817": pickle.loads(
-        b"\x80\x04\x95E\x00\x00\x00\x00\x00\x00\x00\x8cAGive the frog a giant smile, and give it human teeth with braces.\x94."
-    ),
-    "2a800d96-ba32-4d49-ba4e-8d913a8a9c9c": pickle.loads(b"\x80\x04]\x94."),
-    "cab2ef82-f184-4c18-9432-a76076f0942a": pickle.loads(
-        b"\x80\x04\x95K\x00\x00\x00\x00\x00\x00\x00\x8cGIt's raining, and the frog loves it. It looks at the camera and smiles.\x94."
-    ),
+    "b545fdac-c8b8-41ba-abb8-7860afc9e84c": "Local Execution",
+    "1d9beaec-ec3e-4795-a74c-6d37e5f90813": "",
+    "4f6a996a-a34c-4201-a4a2-2df79b0d3682": "This workflow demonstrates the use of Reference Images for the Veo Text to Video (With Reference Images) node",
+    "541f3ffa-95a4-45bb-98eb-35483746b0e1": "Generate a video of the frog that takes into account the reference images.",
+    "1b171537-4b50-44f2-baef-d5da7e2370ca": "Create the initial starting image",
+    "f7ff9c6b-37fc-4b82-8164-67928878c2e4": "Create something specific about the frog - like teeth",
+    "9b696160-12a6-4aef-a82a-23be280139d4": "Extreme close-up nighttime shot of a tiny green tree frog clinging to a translucent jungle leaf, illuminated by soft backlighting that highlights the intricate veins of the leaf. The frog's textured skin glistens with dew droplets, showcasing stunning detail and vibrant green tones. Dappled light filters through the dense, dark jungle environment, creating a dramatic and moody atmosphere. Foreground dust particles float gently, adding depth and realism to the scene. A composition worthy of an award-winning nature magazine cover.",
+    "90f10c8c-f1b1-4130-8046-156f7b01f30e": [],
+    "04194d5a-968d-44c8-80e5-301a2000b817": "Give the frog a giant smile, and give it human teeth with braces.",
+    "2a800d96-ba32-4d49-ba4e-8d913a8a9c9c": [],
+    "cab2ef82-f184-4c18-9432-a76076f0942a": "It's raining, and the frog loves it. It looks at the camera and smiles.",
 }
 
 "# Create the Flow, then do work within it as context."
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Node modules import their siblings by bare name (e.g. ``from googleai_utils import ...``),
+# the same way the Griptape Nodes engine loads them from the library directory.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "googleai"))
@@ -0,0 +1,110 @@
+import itertools
+import json
+import os
+
+import googleai_utils
+import pytest
+from googleai_utils import LogBuffer, backoff_delays, get_service_account_project_id, parse_gcs_uri
+
+
+class TestBackoffDelays:
+    def test_delays_stay_within_bounds(self) -> None:
+        base, factor, max_delay = 2.0, 1.5, 15.0
+        expected = base
+        for delay in itertools.islice(backoff_delays(base=base, factor=factor, max_delay=max_delay), 50):
+            assert 0.5 * expected <= delay <= expected <= max_delay
+            expected = min(max_delay, expected * factor)
+
+    def test_delays_still_vary_after_cap(self) -> None:
+        delays = list(itertools.islice(backoff_delays(base=2.0, factor=1.5, max_delay=15.0), 100))
+        capped = delays[20:]
+        assert all(7.5 <= delay <= 15.0 for delay in capped)
+        assert len(set(capped)) > 1
+
+
+class TestParseGcsUri:
+    def test_splits_bucket_and_blob_path(self) -> None:
+        assert parse_gcs_uri("gs://my-bucket/videos/sample_0.mp4") == ("my-bucket", "videos/sample_0.mp4")
+
+    @pytest.mark.parametrize(
+        "gcs_uri",
+        [
+            "",
+            "gs://",
+            "gs://bucket",
+            "gs://bucket/",
+            "gs:///blob.mp4",
+            "https://bucket/blob.mp4",
+            "s3://bucket/blob.mp4",
+        ],
+    )
+    def test_rejects_invalid_uris(self, gcs_uri: str) -> None:
+        with pytest.raises(ValueError, match="Invalid GCS URI"):
+            parse_gcs_uri(gcs_uri)
+
+
+class TestGetServiceAccountProjectId:
+    def test_rereads_file_when_mtime_changes(self, tmp_path) -> None:
+        key_file = tmp_path / "service_account.json"
+        key_file.write_text(json.dumps({"project_id": "first-project"}))
+        os.utime(key_file, ns=(1_000_000_000, 1_000_000_000))
+        assert get_service_account_project_id(str(key_file)) == "first-project"
+
+        key_file.write_text(json.dumps({"project_id": "rotated-project"}))
+        os.utime(key_file, ns=(1_000_000_000, 1_000_000_000))
+        # Same mtime: the memoized value is still returned
+        assert get_service_account_project_id(str(key_file)) == "first-project"
+
+        os.utime(key_file, ns=(2_000_000_000, 2_000_000_000))
+        assert get_service_account_project_id(str(key_file)) == "rotated-project"
+
+    def test_missing_file_raises(self, tmp_path) -> None:
+        with pytest.raises(FileNotFoundError):
+            get_service_account_project_id(str(tmp_path / "missing.json"))
+
+
+class TestLogBuffer:
+    @pytest.fixture
+    def clock(self, monkeypatch) -> list[float]:
+        now = [100.0]
+        monkeypatch.setattr(googleai_utils.time, "monotonic", lambda: now[0])
+        return now
+
+    def test_first_line_flushes_immediately(self, clock) -> None:
+        flushed: list[str] = []
+        buffer = LogBuffer(flushed.append, max_lines=3, interval_seconds=1.0)
+        buffer.append("first")
+        assert flushed == ["first\n"]
+
+    def test_flushes_once_max_lines_are_buffered(self, clock) -> None:
+        flushed: list[str] = []
+        buffer = LogBuffer(flushed.append, max_lines=3, interval_seconds=1.0)
+        buffer.append("first")
+        buffer.append("a")
+        buffer.append("b")
+        assert flushed == ["first\n"]
+        buffer.append("c")
+        assert flushed == ["first\n", "a\nb\nc\n"]
+
+    def test_flushes_once_interval_has_passed(self, clock) -> None:
+        flushed: list[str] = []
+        buffer = LogBuffer(flushed.append, max_lines=10, interval_seconds=1.0)
+        buffer.append("first")
+        clock[0] += 0.5
+        buffer.append("a")
+        assert flushed == ["first\n"]
+        clock[0] += 0.5
+        buffer.append("b")
+        assert flushed == ["first\n", "a\nb\n"]
+
+    def test_flush_and_clear(self, clock) -> None:
+        flushed: list[str] = []
+        buffer = LogBuffer(flushed.append, max_lines=10, interval_seconds=1.0)
+        buffer.flush()
+        assert flushed == []
+        # The flush above restarted the interval, so these lines stay buffered until cleared
+        buffer.append("a")
+        buffer.append("b")
+        buffer.clear()
+        buffer.flush()
+        assert flushed == []